@@ -1,5 +1,3 @@
 """
 Root package initialization.
 """
-
-from app.app import app 
\ No newline at end of file
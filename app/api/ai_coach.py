@@ -3,7 +3,7 @@ from ..db.supabase import get_supabase
 from ..auth.middleware import verify_app_token
 from pydantic import BaseModel
 from typing import Optional, List
-import json
+import orjson
 import redis 
 from ..config import settings
 import logging
@@ -11,6 +11,16 @@ import logging
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+redis_client = redis.Redis(
+    connection_pool=redis.BlockingConnectionPool(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        max_connections=64,
+        socket_keepalive=True,
+        health_check_interval=30
+    )
+)
+
 class AiCoach(BaseModel):
     id: str
     created_at: str
@@ -47,7 +57,7 @@ class CreateAICoachReq(BaseModel):
     token_mint: str
 
 
-def get_category_from_truth_index(truth_index: int) -> str:
+def _category_for_truth_index(truth_index: int) -> str:
     if truth_index >= 81 and truth_index <= 100:
         return 'Unfiltered truth teller'
     elif truth_index >= 61 and truth_index <= 80:
@@ -59,6 +69,14 @@ def get_category_from_truth_index(truth_index: int) -> str:
     else:
         return 'Lighthearted ally'
 
+# truth_index is stored as an integer 0-100, so resolve every bucket once
+_CATEGORY_BY_TRUTH_INDEX = tuple(_category_for_truth_index(i) for i in range(101))
+
+def get_category_from_truth_index(truth_index: int) -> str:
+    if type(truth_index) is int and 0 <= truth_index <= 100:
+        return _CATEGORY_BY_TRUTH_INDEX[truth_index]
+    return _category_for_truth_index(truth_index)
+
 def add_category_to_agent(agent: dict) -> dict:
     return {
         **agent,
@@ -134,10 +152,9 @@ async def create_ai_coach(
 @router.get("/cached")
 async def get_ai_coach_cached():
     try:
-        local_redis = redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT)
-        value = local_redis.get('ai_coaches')
+        value = redis_client.get('ai_coaches')
         if value: 
-            data = json.loads(value)
+            data = orjson.loads(value)
             return {
                 'cached': True,
                 'data': data
@@ -290,11 +307,9 @@ async def get_ai_coach_by_id(
 @router.post("/cached")
 async def set_ai_coach_cached(data: List[AiCoach]):
     try:
-        json_data = json.dumps([coach.dict() for coach in data])
+        json_data = orjson.dumps([coach.dict() for coach in data])
         
-        local_redis = redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT)
-
-        result = local_redis.set('ai_coaches', json_data)
+        result = redis_client.set('ai_coaches', json_data)
         if not result:
             raise HTTPException(status_code=500, detail="Failed to cache AI coaches list.")
         
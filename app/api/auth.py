@@ -2,7 +2,7 @@ import uuid
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from jose import jwt
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from ..config.settings import JWT_SECRET
 from ..db.supabase import get_supabase
 
@@ -26,7 +26,7 @@ async def verify_turnkey_proof(request: TurnkeyProofRequest):
         # Create token payload
         payload = {
             "sub": user[0]["id"],  # TODO: Replace with actual user ID after verification
-            "iat": datetime.utcnow(),
+            "iat": datetime.now(timezone.utc),
         }
         
         # Sign the token
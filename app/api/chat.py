@@ -1,10 +1,11 @@
 from typing import Dict, Any, List
 import uuid
+import asyncio
 import logging
 from fastapi import APIRouter, HTTPException, Depends
 from starlette.requests import Request
 from ..db.supabase import get_supabase
-from ..core.agent_system import AgentSystem
+from ..core.agent_system import AgentSystem, get_shared_agent_system
 from ..models import api as models
 from ..auth.middleware import verify_app_token
 from typing import List, Optional
@@ -77,17 +78,10 @@ class AudioClipsResponse(BaseModel):
     audio_clips: List[AudioClip]
 
 def get_agent_system() -> AgentSystem:
-    """Dependency to get the agent system instance."""
-    from ..config import settings
-    
+    """Dependency to get the shared agent system instance."""
     try:
-        agent = AgentSystem(
-            redis_host=settings.REDIS_HOST,
-            redis_port=settings.REDIS_PORT,
-            cache_ttl=settings.REDIS_CACHE_TTL,
-            flush_interval=settings.FLUSH_INTERVAL,
-            buffer_size=settings.BUFFER_SIZE
-        )
+        agent = get_shared_agent_system()
+        agent.refresh_personas()
         return agent
     except Exception as e:
         raise HTTPException(
@@ -203,7 +197,8 @@ async def generate_truth_bomb(
 ) -> models.TestResponse:
     """Generate a targeted truth bomb based on conversation analysis."""
     try:
-        analysis = agent.analyze_conversation(request.messages)
+        # The LLM call inside is blocking, keep it off the event loop
+        analysis = await asyncio.to_thread(agent.analyze_conversation, request.messages)
         
         # Ensure we always have a valid string for the question field
         truth_bomb = analysis.get("truth_bomb")
@@ -229,8 +224,6 @@ async def generate_truth_bomb(
             },
             persona_id=request.persona_id,
         )
-    finally:
-        agent.close()
 
 @router.get("/health", response_model=models.HealthResponse)
 async def health_check(
@@ -258,8 +251,6 @@ async def health_check(
             status_code=500,
             detail=f"Health check failed: {str(e)}"
         )
-    finally:
-        agent.close()
 
 @router.get("/user_chats", response_model=ChatListResponse)
 async def get_user_chats(user_id: str = Depends(verify_app_token)):
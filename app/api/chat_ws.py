@@ -2,11 +2,12 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, De
 from typing import Dict, Set, Optional, List, Union
 from pydantic import BaseModel
 import json
+import asyncio
 import hashlib
 from ..auth.middleware import verify_app_token
 from ..db.supabase import get_supabase
 from ..api.utils.notification import send_notification
-from ..core.agent_system import AgentSystem
+from ..core.agent_system import AgentSystem, get_shared_agent_system
 from ..models import api as models
 
 router = APIRouter()
@@ -49,17 +50,10 @@ class ConversationData:
 conversation_count: Dict[str, ConversationData] = {}
 
 def get_agent_system() -> AgentSystem:
-    """Dependency to get the agent system instance."""
-    from ..config import settings
-    
+    """Dependency to get the shared agent system instance."""
     try:
-        agent = AgentSystem(
-            redis_host=settings.REDIS_HOST,
-            redis_port=settings.REDIS_PORT,
-            cache_ttl=settings.REDIS_CACHE_TTL,
-            flush_interval=settings.FLUSH_INTERVAL,
-            buffer_size=settings.BUFFER_SIZE
-        )
+        agent = get_shared_agent_system()
+        agent.refresh_personas()
         return agent
     except Exception as e:
         raise HTTPException(
@@ -79,7 +73,8 @@ async def analyse_and_generate_truth_bomb(messages: List[dict], agent: AgentSyst
             ) for msg in messages
         ]
 
-        analysis = agent.analyze_conversation(formatted_messages)
+        # The LLM call inside is blocking, keep it off the event loop
+        analysis = await asyncio.to_thread(agent.analyze_conversation, formatted_messages)
         print("Analysis:", analysis)
         truth_bomb = analysis.get("truth_bomb")
         print("Truth bomb:", truth_bomb)
@@ -97,7 +92,7 @@ def get_hash(user_id1: str, user_id2: str) -> str:
     sorted_ids = sorted([user_id1, user_id2])
 
     merged_string = str(sorted_ids[0]) + str(sorted_ids[1])
-    return hashlib.sha256(merged_string.encode()).hexdigest()
+    return hashlib.blake2b(merged_string.encode(), digest_size=16).hexdigest()
 
 async def generate_truth_bomb_and_send(user_id1: str, user_id2: str, interaction_freq: int) :
     print(f"generating truth bomb for {user_id1} and {user_id2}")
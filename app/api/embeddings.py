@@ -1,14 +1,13 @@
 from fastapi import APIRouter, HTTPException, Depends
-from app.models.embeddings import OptimizedEmbeddingManager
+from app.models.embeddings import get_embedding_manager
 from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, Field
 
 router = APIRouter()
-embedding_manager = OptimizedEmbeddingManager()
 
 @router.on_event("startup")
 async def startup_event():
-    await embedding_manager.init_faiss_index()
+    await get_embedding_manager().init_faiss_index()
 
 class SearchSimilarRequest(BaseModel):
     response: str = Field(..., description="Response text to search for similarities")
@@ -27,7 +26,7 @@ class TextEmbedRequest(BaseModel):
 async def search_similar_responses(request: SearchSimilarRequest):
     """Search for similar responses using optimized embedding search"""
     try:
-        result = await embedding_manager.search_similar_responses(
+        result = await get_embedding_manager().search_similar_responses(
             response=request.response,
             user_id=request.user_id,
             agent_id=request.agent_id,
@@ -46,7 +45,7 @@ async def create_text_embeddings(
 ):
     """Create and store text embeddings one at a time"""
     try:
-        result = await embedding_manager.create_text_embeddings(
+        result = await get_embedding_manager().create_text_embeddings(
             items=request.texts,
             user_id=request.user_id,
             agent_id=request.agent_id,
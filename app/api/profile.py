@@ -4,6 +4,7 @@ from typing import Optional, List, Dict, Any
 from datetime import date
 from ..auth.middleware import verify_app_token
 from ..db.supabase import get_supabase
+from postgrest.types import ReturnMethod
 from .utils.cache import get_user_by_id, update_user_cache, invalidate_user_cache
 import uuid
 from fastapi import UploadFile, File
@@ -14,6 +15,19 @@ import asyncio
 
 router = APIRouter()
 
+
+async def _get_profile_with_reviews(user_id: str):
+    """Fetch the (cached) profile and its pending reviews concurrently"""
+    supabase = get_supabase()
+    reviews_query = supabase.from_("profile_reviews").select("*").eq("profile_id", user_id)
+    # The reviews request is listed first so its worker thread is already in
+    # flight while get_user_by_id runs its own blocking lookups.
+    reviews_response, profile_data = await asyncio.gather(
+        asyncio.to_thread(reviews_query.execute),
+        get_user_by_id(user_id)
+    )
+    return profile_data, reviews_response.data
+
 class Location(BaseModel):
     coords: Optional[Dict[str, Any]] = None
     timestamp: Optional[float] = None
@@ -240,12 +254,12 @@ async def update_user_profile(
 
         # Create review entries if any
         if review_entries:
-            supabase.table("profile_reviews").insert(review_entries).execute()
+            # The rows are re-read below, don't ship them back twice
+            supabase.table("profile_reviews").insert(review_entries, returning=ReturnMethod.minimal).execute()
 
         # Get updated profile with reviews
-        updated_profile = await get_user_by_id(user_id)
-        reviews_response = supabase.from_("profile_reviews").select("*").eq("profile_id", user_id).execute()
-        updated_profile["profile_reviews"] = reviews_response.data
+        updated_profile, profile_reviews = await _get_profile_with_reviews(user_id)
+        updated_profile["profile_reviews"] = profile_reviews
             
         return {
             "success": True,
@@ -261,9 +275,9 @@ async def get_my_profile(request: Request, user_id: str = Depends(verify_app_tok
     Get the current user's profile using their access token.
     """
     try:
-        # First try to get from cache
+        # Profile comes from cache, reviews are not cached so fetch both at once
         print("user_id", user_id)
-        profile_data = await get_user_by_id(user_id)
+        profile_data, profile_reviews = await _get_profile_with_reviews(user_id)
         print("profile_data", profile_data)
         
         if not profile_data:
@@ -272,12 +286,8 @@ async def get_my_profile(request: Request, user_id: str = Depends(verify_app_tok
                 detail="Profile not found"
             )
 
-        # Get reviews separately since they're not cached
-        supabase = get_supabase()
-        reviews_response = supabase.from_("profile_reviews").select("*").eq("profile_id", user_id).execute()
-        
         # Add reviews data to profile
-        profile_data["profile_reviews"] = reviews_response.data
+        profile_data["profile_reviews"] = profile_reviews
             
         return {
             "success": True,
@@ -1,8 +1,11 @@
 from fastapi import APIRouter, HTTPException, Query, Path
 from pydantic import BaseModel
 from typing import Optional, Dict, Any, List
+import asyncio
+import logging
 import httpx
-import json
+import orjson
+from cachetools import TTLCache
 from ..config.settings import ASTRALANE_API_KEY
 from datetime import datetime
 from ..utils.helpers import generate_cache_key
@@ -13,18 +16,27 @@ from fastapi import Depends
 from ..db.supabase import get_supabase
 from ..config.settings import  REDIS_URL
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 # Initialize Redis client
 redis_client = redis.from_url(
     url=REDIS_URL,
-    decode_responses=True
+    decode_responses=False
 )
 
 # Cache TTLs
 PRICE_CACHE_TTL = 60  # 1 minute for price
 OHLCV_CACHE_TTL = 300  # 5 minutes for OHLCV
 
+# In-process L1 caches in front of Redis, holding already parsed payloads.
+# Kept well below the Redis TTLs so an entry copied from Redis just before
+# it expires cannot stretch staleness much. Only touched from the event loop
+# thread, so no locking is needed.
+price_l1_cache = TTLCache(maxsize=10_000, ttl=10)
+ohlcv_l1_cache = TTLCache(maxsize=10_000, ttl=60)
+
 # API Headers
 API_HEADERS = {
     "x-api-key": ASTRALANE_API_KEY,
@@ -72,6 +84,78 @@ class OHLCVResponse(BaseModel):
 class TokenVanityUseRequest(BaseModel):
     public_key: str
 
+# Upstream calls currently in flight, keyed by cache key
+inflight_requests: Dict[str, asyncio.Task] = {}
+
+async def singleflight(cache_key: str, fetch):
+    """Let concurrent cache misses for the same key share one upstream call"""
+    task = inflight_requests.get(cache_key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        inflight_requests[cache_key] = task
+        task.add_done_callback(lambda _: inflight_requests.pop(cache_key, None))
+    # shield so a disconnecting client does not cancel the call for the others
+    return await asyncio.shield(task)
+
+async def fetch_token_prices(tokens: str, cache_key: str) -> Dict[str, Any]:
+    """Fetch token prices from Astralane and populate both cache levels"""
+    async with httpx.AsyncClient() as client:
+        response = await client.get(
+            f"https://graphql.astralane.io/api/v1/price-by-token?tokens={tokens}",
+            headers=API_HEADERS,
+            timeout=10.0
+        )
+        logger.debug("Token price response: %s", response)
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"Token price API error: {response.text}"
+            )
+        
+        data = response.json()
+        token_data = data.get("data", {}).get("tokens", {})
+        logger.debug("Token price data: %s", token_data)
+        
+        # Cache the result
+        if token_data:
+            redis_client.setex(
+                cache_key,
+                PRICE_CACHE_TTL,
+                orjson.dumps(token_data)
+            )
+            price_l1_cache[cache_key] = token_data
+        
+        return token_data
+
+async def fetch_token_ohlcv(pool_address: str, params: Dict[str, Any], cache_key: str) -> Any:
+    """Fetch OHLCV candles from Astralane and populate both cache levels"""
+    async with httpx.AsyncClient() as client:
+        response = await client.get(
+            f"https://graphql.astralane.io/api/v1/dataset/trade/ohlcv/{pool_address}",
+            headers=API_HEADERS,
+            params=params,
+            timeout=10.0
+        )
+        
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=response.status_code,
+                detail=f"OHLCV API error: {response.text}"
+            )
+        
+        data = response.json()
+        
+        # Cache the raw data
+        if data:
+            redis_client.setex(
+                cache_key,
+                OHLCV_CACHE_TTL,
+                orjson.dumps(data)
+            )
+            ohlcv_l1_cache[cache_key] = data
+        
+        return data
+
 @router.get("/price", response_model=TokenPriceResponse)
 async def get_token_prices(
     tokens: str,
@@ -84,13 +168,17 @@ async def get_token_prices(
     try:
         # Try to get from cache first
         cache_key = generate_cache_key("token_prices", tokens)
-        cached_data = redis_client.get(cache_key)
-        print('cached_data', cached_data)
-        if cached_data is not None:
+        token_data = price_l1_cache.get(cache_key)
+        if token_data is None:
+            cached_data = redis_client.get(cache_key)
+            logger.debug("Token price Redis hit: %s", cached_data is not None)
+            if cached_data is not None:
+                token_data = price_l1_cache[cache_key] = orjson.loads(cached_data)
+        if token_data is not None:
             return {
                 "success": True,
                 "message": "Token prices fetched from cache",
-                "data": json.loads(cached_data)
+                "data": token_data
             }
 
         # GraphQL query for token prices
@@ -110,37 +198,16 @@ async def get_token_prices(
         # }
 
         # If not in cache, fetch from API
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://graphql.astralane.io/api/v1/price-by-token?tokens={tokens}",
-                headers=API_HEADERS,
-                timeout=10.0
-            )
-            print('response', response)
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Token price API error: {response.text}"
-                )
-            
-            data = response.json()
-            print('data', data)
-            token_data = data.get("data", {}).get("tokens", {})
-            print('token_data', data)
-            
-            # Cache the result
-            if token_data:
-                redis_client.setex(
-                    cache_key,
-                    PRICE_CACHE_TTL,
-                    json.dumps(token_data)
-                )
-            
-            return {
-                "success": True,
-                "message": "Token prices fetched successfully",
-                "data": token_data
-            }
+        token_data = await singleflight(
+            cache_key,
+            lambda: fetch_token_prices(tokens, cache_key)
+        )
+        
+        return {
+            "success": True,
+            "message": "Token prices fetched successfully",
+            "data": token_data
+        }
             
     except httpx.TimeoutException:
         raise HTTPException(
@@ -183,12 +250,16 @@ async def get_token_ohlcv(
         cache_key = generate_cache_key("token_ohlcv", cache_params)
         
         # Try to get from cache first
-        cached_data = redis_client.get(cache_key)
-        if cached_data:
+        candles = ohlcv_l1_cache.get(cache_key)
+        if candles is None:
+            cached_data = redis_client.get(cache_key)
+            if cached_data:
+                candles = ohlcv_l1_cache[cache_key] = orjson.loads(cached_data)
+        if candles:
             return {
                 "success": True,
                 "message": "OHLCV data fetched from cache",
-                "data": [OHLCVData(**candle) for candle in json.loads(cached_data)]
+                "data": [OHLCVData(**candle) for candle in candles]
             }
 
         # Build query parameters
@@ -198,35 +269,16 @@ async def get_token_ohlcv(
         if to_time:
             params["to"] = to_time
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://graphql.astralane.io/api/v1/dataset/trade/ohlcv/{pool_address}",
-                headers=API_HEADERS,
-                params=params,
-                timeout=10.0
-            )
-            
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"OHLCV API error: {response.text}"
-                )
-            
-            data = response.json()
-            
-            # Cache the raw data
-            if data:
-                redis_client.setex(
-                    cache_key,
-                    OHLCV_CACHE_TTL,
-                    json.dumps(data)
-                )
-            
-            return {
-                "success": True,
-                "message": "OHLCV data fetched successfully",
-                "data": data
-            }
+        data = await singleflight(
+            cache_key,
+            lambda: fetch_token_ohlcv(pool_address, params, cache_key)
+        )
+        
+        return {
+            "success": True,
+            "message": "OHLCV data fetched successfully",
+            "data": data
+        }
             
     except httpx.TimeoutException:
         raise HTTPException(
@@ -14,7 +14,7 @@ import httpx
 from ..config.settings import TURNKEY_API_PUBLIC_KEY, TURNKEY_API_PRIVATE_KEY, TURNKEY_ORGANIZATION_ID
 from jose import jwt
 from ..config.settings import JWT_SECRET
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from ..db.supabase import get_supabase
 
 router = APIRouter()
@@ -419,7 +419,7 @@ async def verify_otp(request: VerifyOTPRequest):
             # Create token payload
             payload = {
                 "sub": user[0]["id"],
-                "iat": datetime.utcnow(),
+                "iat": datetime.now(timezone.utc),
             }
 
             # Sign the token
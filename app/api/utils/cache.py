@@ -1,5 +1,5 @@
 import redis
-import json
+import orjson
 import os
 from typing import Optional, Dict, Any
 from ...db.supabase import get_supabase
@@ -8,7 +8,7 @@ from ...config.settings import  REDIS_URL, REDIS_CACHE_TTL
 # Initialize Redis client
 redis_client = redis.from_url(
     url=REDIS_URL,
-    decode_responses=True
+    decode_responses=False
 )
 
 CACHE_TTL = REDIS_CACHE_TTL  # Use the TTL from settings
@@ -27,7 +27,7 @@ async def get_user_by_id(user_id: str) -> Optional[Dict[str, Any]]:
     
     if cached_profile:
         print(f"Returning cached profile for {user_id}")
-        return json.loads(cached_profile)
+        return orjson.loads(cached_profile)
     
     # If not in cache, get from database
     try:
@@ -59,7 +59,7 @@ async def update_user_cache(user_id: str, profile_data: Dict[str, Any]) -> None:
     redis_client.setex(
         cache_key,
         300,
-        json.dumps(profile_data)
+        orjson.dumps(profile_data)
     )
 
 def invalidate_user_cache(user_id: str) -> None:
@@ -8,6 +8,7 @@ from ..utils.telegram import (
 )
 from ..services.metrics import process_metrics_webhook
 from ..config.settings import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
+from ..db.supabase import get_supabase
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -77,12 +78,7 @@ async def profile_webhook(request: Request):
             )
 
         try:
-            from supabase import create_client
-            from ..config.settings import SUPABASE_URL, SUPABASE_KEY
-            
-            supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-            
-            result = supabase.table('profiles').update({
+            result = get_supabase().table('profiles').update({
                 'verification_status': 'initial_review'
             }).eq('id', record.get('id')).execute()
             
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query, Request, HTTPException
 from typing import Dict, List, Optional, Union
-from datetime import datetime
+from datetime import datetime, timezone
 import json
 import logging
 
@@ -162,7 +162,7 @@ async def websocket_endpoint(
                 message_data = json.loads(data)
                 # Add a timestamp if not present
                 if "timestamp" not in message_data:
-                    message_data["timestamp"] = str(datetime.utcnow())
+                    message_data["timestamp"] = str(datetime.now(timezone.utc))
                 
                 # Handle direct messages if target_user_id is specified
                 if "target_user_id" in message_data:
@@ -187,7 +187,7 @@ async def websocket_endpoint(
             json.dumps({
                 "type": "system",
                 "content": f"User {user_id} has left the room",
-                "timestamp": str(datetime.utcnow())
+                "timestamp": str(datetime.now(timezone.utc))
             }),
             room_id
         )
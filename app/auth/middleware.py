@@ -1,11 +1,8 @@
 from fastapi import Request, HTTPException, Depends
-from supabase import create_client, Client
-from ..config.settings import SUPABASE_URL, SUPABASE_KEY, JWT_SECRET
+from ..config.settings import JWT_SECRET
 from jose import jwt
 from typing import Optional
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
-
 async def auth_middleware(request: Request):
     """
     Middleware to handle authentication using Supabase JWT tokens.
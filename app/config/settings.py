@@ -16,6 +16,9 @@ TEXT_API_MODEL = os.getenv("HYPERBOLIC_TEXT_API_MODEL", "meta-llama/Llama-3.3-70
 IMAGE_API_URL = os.getenv("HYPERBOLIC_IMAGE_API_URL")
 IMAGE_API_MODEL = os.getenv("HYPERBOLIC_IMAGE_API_MODEL", "FLUX.1-dev")
 
+# Sentence embedding runtime: "torch", or "onnx" / "openvino" for inference-only runtimes
+EMBEDDING_BACKEND = os.getenv("SWIFEY_EMBEDDING_BACKEND", "torch")
+
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
 REDIS_CACHE_TTL = int(os.getenv("REDIS_CACHE_TTL", "3600"))
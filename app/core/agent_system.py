@@ -1,9 +1,12 @@
-import json
+import orjson
 import redis
 import queue
+import random
 import re
 import logging
 import threading
+import time
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
@@ -16,7 +19,20 @@ from ..config import settings
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Pushed onto the feedback buffer by close() to wake the blocked worker
+_STOP_FEEDBACK = object()
+
 class AgentSystem:
+    _PERSONAS_CACHE_KEY = 'dating_personas:by_id'
+    _PERSONAS_VERSION_KEY = 'dating_personas:version'
+    _PERSONAS_CACHE_TTL = 6 * 60 * 60
+
+    # (version, raw hash) of the last persona fetch, shared by every instance
+    # in the process so unchanged personas are not re-read from Redis.
+    _personas_snapshot = (None, {})
+    _FEEDBACK_BATCH_SIZE = 100
+    _MAX_CACHE_WRITE_ATTEMPTS = 5
+
     _PERSONA_TYPES = {
         "truth_revealer": {
             "name": "Truth Oracle",
@@ -54,11 +70,15 @@ class AgentSystem:
             logger.warning(f"Failed to initialize LLM adapter: {e}. Will use fallback responses.")
             self.llm = None
         
-        self.redis_client = redis.Redis(
+        self.redis_pool = redis.BlockingConnectionPool(
             host=redis_host,
             port=redis_port,
-            decode_responses=True
+            max_connections=64,
+            socket_keepalive=True,
+            health_check_interval=30,
+            decode_responses=False
         )
+        self.redis_client = redis.Redis(connection_pool=self.redis_pool)
         self.cache_ttl = cache_ttl
         self.personas = self._load_personas()
         
@@ -145,7 +165,6 @@ class AgentSystem:
                         
                 except (LLMAuthenticationError, LLMConnectionError) as e:
                     logger.warning(f"LLM unavailable: {e}. Using persona-based response.")
-                    self.llm = None  
                 except Exception as e:
                     logger.error(f"Error in LLM analysis: {e}")
             
@@ -302,7 +321,6 @@ class AgentSystem:
                         "Growth happens when we stay open to possibilities. What possibilities do you see here?"
                     ]
             
-            import random
             response = random.choice(patterns)
             
             if engagement_score < 0.5:
@@ -328,30 +346,7 @@ class AgentSystem:
                 "confidence": 0.5
             }
             
-    def _create_llm_prompt(self, messages: List[Dict], context_summary: Dict[str, Any]) -> str:
-        """Create a structured prompt for LLM analysis focusing on conversation dynamics and truth bombs"""
-        try:
-            persona_id = messages[0].get("metadata", {}).get("persona_id", "truth_revealer")
-            persona = self.personas.get(persona_id, {})
-            
-            max_context = messages[0].get("metadata", {}).get("max_context_messages", 10)
-            
-            conversation = "\n".join([
-                f"{msg['sender']}: {msg['content']}"
-                for msg in messages[-max_context:]  
-            ])
-            
-            engagement = context_summary["engagement_metrics"]
-            signals = context_summary["interaction_signals"]
-            health = context_summary["conversation_health"]
-            safety = context_summary["safety_indicators"]
-            
-            persona_name = persona.get('name', 'Truth Oracle')
-            persona_style = persona.get('communication_style', 'direct and honest')
-            
-            persona_intro = f"""As {persona_name}, you reveal truths about dating interactions with a {persona_style} style."""
-
-            prompt = f"""{persona_intro} and you are a direct dating conversation
+    _TRUTH_BOMB_PROMPT = """ and you are a direct dating conversation
 
     Analyze this dating conversation and provide ONE direct truth bomb. Give ONLY the truth bomb statement - no explanations or analysis.
 
@@ -359,12 +354,12 @@ class AgentSystem:
     {conversation}
 
     Context & Metrics:
-    Engagement Level: {engagement.get('engagement_score', 0.0):.2f}/1.0
-    Flirting Level: {signals.get('flirting_level', 0.0):.2f}/1.0
-    Message Quality: {signals.get('message_quality', 0.0):.2f}/1.0
-    Response Time: {signals.get('response_time', 0.0):.2f} minutes
-    Respect Score: {health.get('respect_score', 1.0):.2f}/1.0
-    Risk Level: {safety.get('risk_level', 0.0):.2f}/1.0
+    Engagement Level: {engagement_score:.2f}/1.0
+    Flirting Level: {flirting_level:.2f}/1.0
+    Message Quality: {message_quality:.2f}/1.0
+    Response Time: {response_time:.2f} minutes
+    Respect Score: {respect_score:.2f}/1.0
+    Risk Level: {risk_level:.2f}/1.0
 
     CHOOSE ONE OF THESE FORMATS AND RESPOND WITH ONLY THE TRUTH BOMB:
 
@@ -420,6 +415,45 @@ class AgentSystem:
 
     GIVE ONLY THE TRUTH BOMB ITSELF. NO CONTEXT. NO EXPLANATIONS."""
 
+    @classmethod
+    @lru_cache(maxsize=32)
+    def _persona_prompt_template(cls, persona_name: str, persona_style: str) -> str:
+        """Build the truth bomb prompt template with the persona intro filled in once"""
+        persona_intro = f"""As {persona_name}, you reveal truths about dating interactions with a {persona_style} style."""
+        persona_intro = persona_intro.replace('{', '{{').replace('}', '}}')
+        return persona_intro + cls._TRUTH_BOMB_PROMPT
+
+    def _create_llm_prompt(self, messages: List[Dict], context_summary: Dict[str, Any]) -> str:
+        """Create a structured prompt for LLM analysis focusing on conversation dynamics and truth bombs"""
+        try:
+            persona_id = messages[0].get("metadata", {}).get("persona_id", "truth_revealer")
+            persona = self.personas.get(persona_id, {})
+            
+            max_context = messages[0].get("metadata", {}).get("max_context_messages", 10)
+            
+            conversation = "\n".join([
+                f"{msg['sender']}: {msg['content']}"
+                for msg in messages[-max_context:]  
+            ])
+            
+            engagement = context_summary["engagement_metrics"]
+            signals = context_summary["interaction_signals"]
+            health = context_summary["conversation_health"]
+            safety = context_summary["safety_indicators"]
+            
+            persona_name = persona.get('name', 'Truth Oracle')
+            persona_style = persona.get('communication_style', 'direct and honest')
+
+            prompt = self._persona_prompt_template(persona_name, persona_style).format(
+                conversation=conversation,
+                engagement_score=engagement.get('engagement_score', 0.0),
+                flirting_level=signals.get('flirting_level', 0.0),
+                message_quality=signals.get('message_quality', 0.0),
+                response_time=signals.get('response_time', 0.0),
+                respect_score=health.get('respect_score', 1.0),
+                risk_level=safety.get('risk_level', 0.0)
+            )
+
             if safety.get('risk_level', 0.0) > 0.4:
                 prompt += """
 
@@ -443,28 +477,43 @@ class AgentSystem:
 
     def _load_personas(self) -> Dict[str, Any]:
         try:
-            cached_personas = self.redis_client.get('dating_personas')
-            logger.info(f"Cached personas: {cached_personas}") 
-            if cached_personas:
-                return json.loads(cached_personas)
-
+            version = self.redis_client.get(self._PERSONAS_VERSION_KEY)
+            cached_version, cached_personas = AgentSystem._personas_snapshot
+            if version is None or version != cached_version:
+                cached_personas = self.redis_client.hgetall(self._PERSONAS_CACHE_KEY)
+                AgentSystem._personas_snapshot = (version, cached_personas)
+            logger.debug("Cached personas: %s", cached_personas)
             personas = {
+                persona_id.decode(): orjson.loads(persona)
+                for persona_id, persona in cached_personas.items()
+            }
+
+            missing_personas = {
                 persona_type: {
                     **config,
                     "type": persona_type,
                     "created_at": datetime.now().isoformat()
                 }
                 for persona_type, config in self._PERSONA_TYPES.items()
+                if persona_type not in personas
             }
-            logger.info(f"Created new personas: {personas}")
-            
-            self.redis_client.setex('dating_personas', 600, json.dumps(personas))
+            if missing_personas:
+                logger.info("Created new personas: %s", list(missing_personas))
+                self._update_persona_cache(missing_personas)
+                personas.update(missing_personas)
+
             return personas
             
         except Exception as e:
             logger.error(f"Error loading personas: {e}")
             return {}
     
+    def refresh_personas(self):
+        """Reload personas when another process has bumped the cache version"""
+        personas = self._load_personas()
+        if personas:
+            self.personas = personas
+
     def _select_best_analysis(self, analyses: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """Select the most relevant analysis based on confidence and type"""
         if not analyses:
@@ -740,34 +789,58 @@ class AgentSystem:
         self.feedback_thread.daemon = True
         self.feedback_thread.start()
 
+    def _collect_feedback_batch(self) -> List[Dict[str, Any]]:
+        """Block for feedback and gather a batch bounded by size and flush interval"""
+        try:
+            feedback = self.feedback_buffer.get(timeout=self.flush_interval)
+        except queue.Empty:
+            return []
+
+        feedback_batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while feedback is not _STOP_FEEDBACK:
+            feedback_batch.append(feedback)
+            remaining = deadline - time.monotonic()
+            if len(feedback_batch) >= self._FEEDBACK_BATCH_SIZE or remaining <= 0:
+                break
+            try:
+                feedback = self.feedback_buffer.get(timeout=remaining)
+            except queue.Empty:
+                break
+
+        return feedback_batch
+
     def _process_feedback(self):
         """Process feedback from the feedback buffer"""
         while not self.should_stop.is_set():
-            try:
-                feedback_batch = []
-                while not self.feedback_buffer.empty() and len(feedback_batch) < 100:
-                    feedback = self.feedback_buffer.get_nowait()
-                    feedback_batch.append(feedback)
-
-                if feedback_batch:
-                    for feedback in feedback_batch:
-                        self._update_persona_metrics(feedback)
-                    
-                    self.should_stop.wait(self.flush_interval)
-            except Exception as e:
-                logger.error(f"Error processing feedback: {e}")
-                for feedback in feedback_batch:
-                    try:
-                        self.feedback_buffer.put(feedback)
-                    except queue.Full:
-                        logger.error("Feedback buffer full, dropping feedback")
-
-    def _update_persona_metrics(self, feedback: Dict[str, Any]):
-        """Update persona metrics based on feedback"""
+            feedback_batch = self._collect_feedback_batch()
+            if not feedback_batch:
+                continue
+
+            updated_personas = {}
+            for feedback in feedback_batch:
+                persona_id = self._update_persona_metrics(feedback)
+                if persona_id:
+                    updated_personas[persona_id] = self.personas[persona_id]
+
+            # Metrics are already applied in memory, so only the cache write
+            # is retried; re-queueing the feedback would apply it twice.
+            attempts = 0
+            while updated_personas and not self._update_persona_cache(updated_personas):
+                attempts += 1
+                if attempts >= self._MAX_CACHE_WRITE_ATTEMPTS:
+                    logger.error(f"Giving up on persona cache write after {attempts} attempts")
+                    break
+                backoff = min(2 ** attempts, 60) * random.uniform(0.5, 1.0)
+                if self.should_stop.wait(backoff):
+                    break
+
+    def _update_persona_metrics(self, feedback: Dict[str, Any]) -> Optional[str]:
+        """Update persona metrics based on feedback, returning the updated persona id"""
         try:
             persona_id = feedback.get('persona_id')
             if not persona_id or persona_id not in self.personas:
-                return
+                return None
 
             persona = self.personas[persona_id]
             
@@ -783,10 +856,11 @@ class AgentSystem:
             ):
                 self._add_successful_question(persona_id, feedback['question'])
 
-            self._update_persona_cache(persona_id, persona)
+            return persona_id
 
         except Exception as e:
             logger.error(f"Error updating persona metrics: {e}")
+            return None
 
     def _add_successful_question(self, persona_id: str, question: str):
         """Add successful question to persona's patterns"""
@@ -796,24 +870,65 @@ class AgentSystem:
                 if len(persona['question_patterns']) >= 20:
                     persona['question_patterns'].pop(0)
                 persona['question_patterns'].append(question)
-                self._update_persona_cache(persona_id, persona)
         except Exception as e:
             logger.error(f"Error adding successful question: {e}")
 
-    def _update_persona_cache(self, persona_id: str, persona: Dict[str, Any]):
-        """Update persona in Redis cache"""
+    def _update_persona_cache(self, personas: Dict[str, Dict[str, Any]]) -> bool:
+        """Write personas to the Redis hash in a single pipelined round trip"""
         try:
-            cached_personas = self.redis_client.get('dating_personas')
-            if cached_personas:
-                personas = json.loads(cached_personas)
-                personas[persona_id] = persona
-                self.redis_client.setex('dating_personas', 600, json.dumps(personas))
+            with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.hset(
+                    self._PERSONAS_CACHE_KEY,
+                    mapping={
+                        persona_id: orjson.dumps(persona)
+                        for persona_id, persona in personas.items()
+                    }
+                )
+                pipe.expire(self._PERSONAS_CACHE_KEY, self._PERSONAS_CACHE_TTL)
+                pipe.incr(self._PERSONAS_VERSION_KEY)
+                pipe.execute()
+            return True
         except Exception as e:
             logger.error(f"Error updating persona cache: {e}")
+            return False
 
     def close(self):
         """Cleanup resources"""
         self.should_stop.set()
+        try:
+            self.feedback_buffer.put_nowait(_STOP_FEEDBACK)
+        except queue.Full:
+            pass  # the worker is busy draining and will see should_stop
         if hasattr(self, 'feedback_thread'):
             self.feedback_thread.join()
-        self.redis_client.close()
\ No newline at end of file
+        self.redis_client.close()
+        self.redis_pool.disconnect()
+        if self.llm is not None:
+            self.llm.close()
+
+
+_agent_system = None
+_agent_system_lock = threading.Lock()
+
+def get_shared_agent_system() -> AgentSystem:
+    """Return the process-wide AgentSystem, creating it on first use"""
+    global _agent_system
+    if _agent_system is None:
+        with _agent_system_lock:
+            if _agent_system is None:
+                _agent_system = AgentSystem(
+                    redis_host=settings.REDIS_HOST,
+                    redis_port=settings.REDIS_PORT,
+                    cache_ttl=settings.REDIS_CACHE_TTL,
+                    flush_interval=settings.FLUSH_INTERVAL,
+                    buffer_size=settings.BUFFER_SIZE
+                )
+    return _agent_system
+
+def close_shared_agent_system():
+    """Stop the shared AgentSystem's worker and release its Redis and LLM connections"""
+    global _agent_system
+    with _agent_system_lock:
+        if _agent_system is not None:
+            _agent_system.close()
+            _agent_system = None
\ No newline at end of file
@@ -1,6 +1,9 @@
 from typing import Callable
 from fastapi import FastAPI
 
+from .agent_system import close_shared_agent_system
+from ..models.chat import close_http_client
+
 
 def create_start_app_handler(app: FastAPI) -> Callable:
     async def start_app() -> None:
@@ -13,6 +16,7 @@ def create_start_app_handler(app: FastAPI) -> Callable:
 def create_stop_app_handler(app: FastAPI) -> Callable:
     async def stop_app() -> None:
         print("Shutting down application...")
-        # Add any cleanup tasks here
+        close_shared_agent_system()
+        await close_http_client()
 
     return stop_app 
\ No newline at end of file
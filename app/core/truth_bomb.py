@@ -9,31 +9,71 @@ from app.models.llm_adapter import LLMAdapter
 
 logger = logging.getLogger(__name__)
 
+# Patterns are compiled once at import instead of being looked up in the re
+# cache for every message of every analysis.
+_FLIRTING_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r"😊|😉|😘|🥰|❤️",  
+        r"haha|lol|lmao",    
+        r"you're (cute|sweet|funny|interesting)",  
+        r"(coffee|drink|date|meet)\?",  
+        r"what( are you|'re you| you) (doing|up to)",
+    )
+]
+
+_ENGAGEMENT_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r"\?", 
+        r"!",   
+        r"(tell me more|interesting|wow|really)",  
+        r"(same|me too|i agree)",  
+        r"(what about you|how about you)"  
+    )
+]
+
+_INTEREST_PATTERNS = [
+    re.compile(pattern) for pattern in (
+        r"(like|love|enjoy|into|fan of) ([\w\s]+)",
+        r"(hobby|interest|passion)",
+        r"(same|too|also|me too)"
+    )
+]
+
+_RISK_PATTERNS = {
+    category: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+    for category, patterns in {
+        "gaslighting": (
+            r"you('re| are) (wrong|mistaken|confused)",
+            r"that (never|didn't) happen",
+            r"you('re| are) (too sensitive|overreacting)",
+            r"you must be (crazy|insane|losing it)",
+        ),
+        "aggression": (
+            r"(shut up|stupid|idiot|dumb|moron)",
+            r"(fuck|shit|damn|bitch|ass)",
+            r"(hate|kill|fight|hurt)",
+            r"\b[A-Z]{4,}\b", 
+            r"(?<![a-zA-Z])DIE(?![a-zA-Z])",
+        ),
+        "pressure": (
+            r"(come on|why not|just do it)",
+            r"don't be (scared|afraid|shy)",
+            r"what('s| is) wrong with you",
+            r"everyone (else does|does it)",
+        )
+    }.items()
+}
+
+_CONVERSATION_KILLERS = frozenset(("k", "oh", "nice", "cool", "sure", "whatever"))
+_POLITE_WORDS = ("please", "thank", "appreciate", "sorry")
+_POSITIVE_EMOJIS = ("😊", "🙂", "😄", "👍")
+
 class TruthBombAnalyzer:
     def __init__(self):
         self.conversation_metrics = {}
-        self._flirting_patterns = [
-            r"😊|😉|😘|🥰|❤️",  
-            r"haha|lol|lmao",    
-            r"you're (cute|sweet|funny|interesting)",  
-            r"(coffee|drink|date|meet)\?",  
-            r"what( are you|'re you| you) (doing|up to)",
-        ]
-        self._engagement_patterns = [
-            r"\?", 
-            r"!",   
-            r"(tell me more|interesting|wow|really)",  
-            r"(same|me too|i agree)",  
-            r"(what about you|how about you)"  
-        ]
-        self.conversation_killers = [
-            "k",
-            "oh",
-            "nice",
-            "cool",
-            "sure",
-            "whatever"
-        ]
+        self._flirting_patterns = _FLIRTING_PATTERNS
+        self._engagement_patterns = _ENGAGEMENT_PATTERNS
+        self.conversation_killers = _CONVERSATION_KILLERS
 
         self.llm_prompt_template = """
         Analyze this dating app conversation and generate an engaging truth bomb or insight that will help keep the conversation going.
@@ -104,8 +144,8 @@ class TruthBombAnalyzer:
         try:
             # Gather all analysis metrics
             signals = self._extract_date_signals(messages)
-            conversation_health = self._assess_conversation_health(messages)
             risk_factors = self._detect_risk_factors(messages)
+            conversation_health = self._assess_conversation_health(messages, risk_factors)
             stage = self._determine_conversation_stage(messages)
             
             # Format the LLM prompt
@@ -201,7 +241,7 @@ class TruthBombAnalyzer:
             length_score = min(1.0, curr_length / 50.0) 
             
             for pattern in self._engagement_patterns:
-                if re.search(pattern, content, re.IGNORECASE):
+                if pattern.search(content):
                     score += 0.2
             
             if i > 0 and curr_length < prev_length * 0.5:
@@ -233,7 +273,7 @@ class TruthBombAnalyzer:
         for msg in messages:
             content = msg["content"].lower()
             for pattern in self._flirting_patterns:
-                if re.search(pattern, content, re.IGNORECASE):
+                if pattern.search(content):
                     flirt_count += 1
                     
         return min(1.0, flirt_count / len(messages))
@@ -266,17 +306,11 @@ class TruthBombAnalyzer:
         
         length_score = min(1.0, avg_length / 100) if avg_length < 100 else min(1.0, 200 / avg_length)
         
-        interest_patterns = [
-            r"(like|love|enjoy|into|fan of) ([\w\s]+)",
-            r"(hobby|interest|passion)",
-            r"(same|too|also|me too)"
-        ]
-        
         interest_matches = 0
         for msg in messages:
             content = msg["content"].lower()
-            for pattern in interest_patterns:
-                if re.search(pattern, content):
+            for pattern in _INTEREST_PATTERNS:
+                if pattern.search(content):
                     interest_matches += 1
                     
         shared_interests_score = min(1.0, interest_matches / (len(messages) * 1.5))
@@ -324,36 +358,14 @@ class TruthBombAnalyzer:
                 "pressure_ratio": 0.0
             }
             
-        risk_patterns = {
-            "gaslighting": [
-                r"you('re| are) (wrong|mistaken|confused)",
-                r"that (never|didn't) happen",
-                r"you('re| are) (too sensitive|overreacting)",
-                r"you must be (crazy|insane|losing it)",
-            ],
-            "aggression": [
-                r"(shut up|stupid|idiot|dumb|moron)",
-                r"(fuck|shit|damn|bitch|ass)",
-                r"(hate|kill|fight|hurt)",
-                r"\b[A-Z]{4,}\b", 
-                r"(?<![a-zA-Z])DIE(?![a-zA-Z])",
-            ],
-            "pressure": [
-                r"(come on|why not|just do it)",
-                r"don't be (scared|afraid|shy)",
-                r"what('s| is) wrong with you",
-                r"everyone (else does|does it)",
-            ]
-        }
-        
-        risk_counts = {category: 0 for category in risk_patterns}
+        risk_counts = {category: 0 for category in _RISK_PATTERNS}
         total_messages = len(messages)
         
         for msg in messages:
             content = msg["content"].lower()
-            for category, patterns in risk_patterns.items():
+            for category, patterns in _RISK_PATTERNS.items():
                 for pattern in patterns:
-                    if re.search(pattern, content, re.IGNORECASE):
+                    if pattern.search(content):
                         risk_counts[category] += 1
         
         gaslighting_ratio = risk_counts["gaslighting"] / total_messages
@@ -368,10 +380,8 @@ class TruthBombAnalyzer:
         
         positive_signals = sum(
             1 for msg in messages
-            if any(word in msg["content"].lower() 
-                for word in ["please", "thank", "sorry", "appreciate"])
-            or any(emoji in msg["content"] 
-                for emoji in ["😊", "🙂", "😄", "👍"])
+            if any(word in msg["content"].lower() for word in _POLITE_WORDS)
+            or any(emoji in msg["content"] for emoji in _POSITIVE_EMOJIS)
         )
         
         severity = max(0.0, severity - (positive_signals * 0.15))
@@ -457,7 +467,7 @@ class TruthBombAnalyzer:
     def analyze_safety_concerns(self, messages: List[Dict]) -> Optional[Dict[str, Any]]:
         """Detect potential safety issues or red flags"""
         risk_factors = self._detect_risk_factors(messages)
-        conversation_health = self._assess_conversation_health(messages)
+        conversation_health = self._assess_conversation_health(messages, risk_factors)
         
         overall_risk = (
             risk_factors["severity"] * 0.6 +
@@ -536,8 +546,12 @@ class TruthBombAnalyzer:
             }
         }
 
-    def _assess_conversation_health(self, messages: List[Dict]) -> Dict[str, float]:
-        """Assess overall conversation health metrics"""
+    def _assess_conversation_health(
+        self,
+        messages: List[Dict],
+        risk_factors: Optional[Dict[str, float]] = None
+    ) -> Dict[str, float]:
+        """Assess overall conversation health metrics, reusing risk factors when already computed"""
         if not messages:
             return {
                 "flow_score": 0.0,
@@ -545,13 +559,14 @@ class TruthBombAnalyzer:
                 "engagement_balance": 0.0
             }
             
-        flow_breaks = sum(1 for msg in messages if msg["content"].lower() in self.conversation_killers)
+        contents = [msg["content"].lower() for msg in messages]
+        flow_breaks = sum(1 for content in contents if content in self.conversation_killers)
         flow_score = 1.0 - (flow_breaks / len(messages))
         
-        risk_factors = self._detect_risk_factors(messages)
-        positive_indicators = sum(1 for msg in messages 
-                                if any(word in msg["content"].lower() 
-                                      for word in ["please", "thank", "appreciate", "sorry"]))
+        if risk_factors is None:
+            risk_factors = self._detect_risk_factors(messages)
+        positive_indicators = sum(1 for content in contents
+                                if any(word in content for word in _POLITE_WORDS))
         respect_score = max(0.0, min(1.0, 1.0 - risk_factors["severity"] + (positive_indicators * 0.1)))
         
         if len(messages) > 1:
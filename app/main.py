@@ -1,6 +1,6 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 import uuid
 import time
@@ -31,6 +31,7 @@ def get_application() -> FastAPI:
         version="0.1.0",
         docs_url="/docs",
         redoc_url="/redoc",
+        default_response_class=ORJSONResponse,
     )
 
     app.add_middleware(
@@ -127,7 +128,7 @@ def get_application() -> FastAPI:
         exc: RequestValidationError
     ):
         """Handle validation errors."""
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=422,
             content={
                 "detail": "Validation Error",
@@ -238,7 +239,7 @@ async def auth_middleware_handler(request: Request, call_next):
         await auth_middleware(request)
         return await call_next(request)
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=401,
             content={"detail": str(e)}
         )
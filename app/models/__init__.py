@@ -1,6 +1,4 @@
-from . import embeddings
-from . import llm_adapter
-from . import persona
-from . import api
-
+# Submodules are imported on demand (``from app.models import api``) rather
+# than here, so importing the lightweight API models does not load
+# sentence-transformers, torch and faiss through ``embeddings``.
 __all__ = ['embeddings', 'llm_adapter', 'persona', 'api']
@@ -1,11 +1,11 @@
 from typing import Dict, Any, Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
 from pydantic import BaseModel, Field
 
 class Message(BaseModel):
     content: str = Field(..., description="Message content")
     sender: str = Field(..., description="Message sender identifier")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Message timestamp")
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), description="Message timestamp")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional message metadata")
 
 class ChatRequest(BaseModel):
@@ -9,6 +9,26 @@ import asyncio
 
 logger = logging.getLogger(__name__)
 
+# Shared client so LLM and image calls reuse pooled keep-alive connections
+_http_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it on first use"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+    return _http_client
+
+async def close_http_client():
+    """Close the shared AsyncClient on shutdown"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 SYSTEM_PROMPT = """You are a professional AI matchmaking assistant that creates personalized agents with memecoin aesthetics.
 Your responses should be natural, contextual, and engaging. Always maintain the conversation flow and context.
 
@@ -105,19 +125,18 @@ async def generate_text_response(content: str, context: Optional[Dict] = None) -
             "top_p": 0.9,
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(url, headers=headers, json=data)
+        response = await get_http_client().post(url, headers=headers, json=data)
+        
+        if response.status_code != 200:
+            logger.error(f"API Error: {response.status_code} - {response.text}")
+            return ""
+            
+        data = response.json()
+        if not data or "choices" not in data or not data["choices"]:
+            logger.error(f"Invalid API response format: {data}")
+            return ""
             
-            if response.status_code != 200:
-                logger.error(f"API Error: {response.status_code} - {response.text}")
-                return ""
-                
-            data = response.json()
-            if not data or "choices" not in data or not data["choices"]:
-                logger.error(f"Invalid API response format: {data}")
-                return ""
-                
-            return data["choices"][0]["message"]["content"]
+        return data["choices"][0]["message"]["content"]
             
     except Exception as e:
         logger.error(f"Error generating response: {str(e)}")
@@ -131,28 +150,27 @@ async def generate_image(prompt: str) -> dict:
         Style: Modern memecoin logo design
         Requirements: Professional, clean, minimal design, no text"""
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                IMAGE_LLM_CONFIG["api_url"],
-                headers={
-                    "Authorization": f"Bearer {IMAGE_LLM_CONFIG['api_key']}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model_name": "FLUX.1-dev",
-                    "prompt": prompt,
-                    "steps": 30,
-                    "cfg_scale": 5,
-                    "enable_refiner": False,
-                    "height": 1024,
-                    "width": 1024,
-                    "backend": "auto"
-                }
-            )
+        response = await get_http_client().post(
+            IMAGE_LLM_CONFIG["api_url"],
+            headers={
+                "Authorization": f"Bearer {IMAGE_LLM_CONFIG['api_key']}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model_name": "FLUX.1-dev",
+                "prompt": prompt,
+                "steps": 30,
+                "cfg_scale": 5,
+                "enable_refiner": False,
+                "height": 1024,
+                "width": 1024,
+                "backend": "auto"
+            }
+        )
+        
+        response.raise_for_status()
+        return response.json()
             
-            response.raise_for_status()
-            return response.json()
-                
     except Exception as e:
         logger.error(f"Error generating image: {str(e)}")
         return {"data": [{"url": None}]}
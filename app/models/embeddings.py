@@ -1,23 +1,29 @@
-import os
 import numpy as np
 from typing import Optional, List, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from sentence_transformers import SentenceTransformer
 import faiss
-from supabase import create_client, Client
-import json
+import torch
+from supabase import Client
+from postgrest.types import ReturnMethod
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
-from functools import lru_cache
+from functools import lru_cache, partial
+import threading
+import logging
+from ..db.supabase import get_supabase
+from ..utils.embeddings import parse_embedding_rows
+from ..config import settings
+
+logger = logging.getLogger(__name__)
 
 class SemanticCache:
     def __init__(self, similarity_threshold=0.95):
         self.cache = {}
         self.similarity_threshold = similarity_threshold
 
-    async def get(self, query: str, embedding_manager):
-        query_embedding = await embedding_manager.get_embedding(query)
-        
+    def get(self, query_embedding: np.ndarray):
+        """Look up results for an L2-normalized float32 query embedding"""
         # Clean expired entries
         now = datetime.now()
         self.cache = {
@@ -25,45 +31,72 @@ class SemanticCache:
             if now - v['timestamp'] < timedelta(hours=24)
         }
         
-        # Check for similar queries
-        for cached_query, cache_entry in self.cache.items():
-            similarity = np.dot(query_embedding, cache_entry['embedding'])
-            if similarity > self.similarity_threshold:
-                return cache_entry['results']
+        if not self.cache:
+            return None
+        
+        # Score every cached query in one matrix-vector product
+        entries = list(self.cache.values())
+        similarities = np.stack([entry['embedding'] for entry in entries]) @ query_embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] > self.similarity_threshold:
+            return entries[best]['results']
         return None
 
     def set(self, query: str, embedding: np.ndarray, results: Dict[str, Any]):
         self.cache[query] = {
-            'embedding': embedding,
+            # Stored L2-normalized so the lookup is a plain dot product
+            'embedding': np.asarray(embedding, dtype=np.float32),
             'results': results,
             'timestamp': datetime.now()
         }
 
 class OptimizedEmbeddingManager:
+    EXACT_SEARCH_MAX_SIZE = 50_000
+
     def __init__(self):
-        url = os.environ.get("SWIFEY_SUPABASE_URL")
-        key = os.environ.get("SWIFEY_SUPABASE_KEY")
-        if not url or not key:
-            raise ValueError("Supabase credentials not found")
-        
-        self.supabase: Client = create_client(url, key)
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+        self.supabase: Client = get_supabase()
+        self._model: Optional[SentenceTransformer] = None
+        self._model_lock = threading.Lock()
         self.embedding_dim = 384
         self.semantic_cache = SemanticCache()
         self.executor = ThreadPoolExecutor(max_workers=4)
         self.embedding_map = {}  
         self.init_index()
 
-    def init_index(self):
-        """Initialize HNSW index for approximate nearest neighbor search"""
-        self.index = faiss.IndexHNSWFlat(self.embedding_dim, 32)  # 32 neighbors per node
+    def init_index(self, expected_size: int = 0):
+        """Initialize the FAISS index, exact for small corpora and HNSW for large ones"""
+        # Vectors are L2-normalized, so inner product is cosine similarity
+        if expected_size < self.EXACT_SEARCH_MAX_SIZE:
+            # A brute-force scan is fast at this size and skips the graph build
+            self.index = faiss.IndexFlatIP(self.embedding_dim)
+            return
+        self.index = faiss.IndexHNSWFlat(self.embedding_dim, 32, faiss.METRIC_INNER_PRODUCT)  # 32 neighbors per node
         self.index.hnsw.efConstruction = 40  # Higher accuracy during construction
         self.index.hnsw.efSearch = 16  # Higher accuracy during search
 
-    @lru_cache(maxsize=1000)
+    @property
+    def model(self) -> SentenceTransformer:
+        """Load the encoder on first use so startup and index loading don't wait on it"""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    model = SentenceTransformer('all-MiniLM-L6-v2', backend=settings.EMBEDDING_BACKEND)
+                    if settings.EMBEDDING_BACKEND == 'torch' and model.device.type == 'cuda':
+                        # fp16 doubles encode throughput on GPU, FAISS paths cast back to float32
+                        model.half()
+                    self._model = model
+        return self._model
+
+    def encode(self, texts: List[str], **kwargs) -> np.ndarray:
+        """Run the model with autograd bookkeeping fully disabled"""
+        # inference_mode is thread-local, so it has to be entered in the executor thread
+        with torch.inference_mode():
+            return self.model.encode(texts, **kwargs)
+
+    @lru_cache(maxsize=4096)
     def get_embedding_sync(self, text: str) -> np.ndarray:
-        """Synchronous method to get embeddings with caching"""
-        embedding = self.model.encode([text])
+        """Synchronous method to get L2-normalized embeddings with caching"""
+        embedding = self.encode([text], normalize_embeddings=True)
         return embedding[0]
 
     async def get_embedding(self, text: str) -> np.ndarray:
@@ -74,71 +107,61 @@ class OptimizedEmbeddingManager:
             text
         )
 
+    async def get_embeddings_batch(self, texts: List[str]) -> np.ndarray:
+        """Encode a batch of texts with one model call, L2-normalized"""
+        return await asyncio.get_event_loop().run_in_executor(
+            self.executor,
+            partial(self.encode, batch_size=32, normalize_embeddings=True),
+            texts
+        )
+
     async def init_faiss_index(self):
         """Initialize FAISS index with existing embeddings"""
         try:
-            print("Starting FAISS index initialization...")
+            logger.info("Starting FAISS index initialization...")
             
             # Pre-filter verified profiles first
-            verified_profiles = self.supabase.table('profiles') \
-                .select('id') \
-                .eq('verification_status', 'approved') \
-                .execute()
+            verified_profiles = await asyncio.to_thread(
+                self.supabase.table('profiles')
+                .select('id')
+                .eq('verification_status', 'approved')
+                .execute
+            )
             
             verified_user_ids = [p['id'] for p in verified_profiles.data] if verified_profiles.data else []
             
             if not verified_user_ids:
-                print("No verified profiles found")
+                logger.info("No verified profiles found")
                 return
                 
             # Get embeddings only for verified users
-            embeddings = self.supabase.table("embeddings") \
-                .select('*') \
-                .in_('user_id', verified_user_ids) \
-                .execute()
+            embeddings = await asyncio.to_thread(
+                self.supabase.table("embeddings")
+                .select('user_id, embedding, embedding_type, data_type, created_at')
+                .in_('user_id', verified_user_ids)
+                .execute
+            )
                 
-            print(f"Retrieved {len(embeddings.data) if embeddings.data else 0} embeddings from database")
+            logger.info("Retrieved %d embeddings from database", len(embeddings.data) if embeddings.data else 0)
             
             if embeddings.data:
-                all_embeddings = []
-                embedding_map = {}
-                
-                for idx, record in enumerate(embeddings.data):
-                    try:
-                        embedding_str = record.get('embedding')
-                        if embedding_str:
-                            embedding_values = embedding_str.strip('[]').split(',')
-                            embedding = np.array([float(x.strip()) for x in embedding_values], dtype=np.float32)
-                            
-                            if len(embedding) == self.embedding_dim:
-                                all_embeddings.append(embedding)
-                                embedding_map[len(all_embeddings) - 1] = record
-                            else:
-                                print(f"Wrong dimension for user {record['user_id']}")
-                        else:
-                            print(f"No embedding data for user {record['user_id']}")
-                    except Exception as e:
-                        print(f"Error processing embedding for user {record.get('user_id')}: {str(e)}")
-                        continue
+                embeddings_array, embedding_map = parse_embedding_rows(embeddings.data, self.embedding_dim)
                 
-                if all_embeddings:
-                    embeddings_array = np.vstack(all_embeddings)
+                if len(embeddings_array):
                     norms = np.linalg.norm(embeddings_array, axis=1)
                     normalized = embeddings_array / norms[:, np.newaxis]
                     
-                    self.init_index()  # Reinitialize HNSW index
+                    self.init_index(len(embeddings_array))
                     self.index.add(normalized.astype('float32'))
                     self.embedding_map = embedding_map
-                    print(f"Successfully initialized HNSW index with {len(all_embeddings)} embeddings")
+                    logger.info("Successfully initialized %s with %d embeddings", type(self.index).__name__, len(embeddings_array))
                 else:
-                    print("No valid embeddings found for FAISS index")
+                    logger.info("No valid embeddings found for FAISS index")
             else:
-                print("No embeddings found in database")
+                logger.info("No embeddings found in database")
                 
         except Exception as e:
-            print(f"Error initializing FAISS index: {e}")
-            import traceback
-            print(traceback.format_exc())
+            logger.exception("Error initializing FAISS index: %s", e)
 
     async def search_similar_responses(
         self,
@@ -149,48 +172,45 @@ class OptimizedEmbeddingManager:
     ) -> Dict[str, Any]:
         """Search for similar responses using improved semantic similarity scoring"""
         try:
+            # Generate the query embedding once, it serves both the cache and the index.
+            # It comes back unit-length, so cosine similarity is a plain dot product
+            normalized_query = np.asarray(await self.get_embedding(response), dtype=np.float32)
+            
             # Check semantic cache first
-            cached_result = await self.semantic_cache.get(response, self)
+            cached_result = self.semantic_cache.get(normalized_query)
             if cached_result:
-                print("Cache hit! Returning cached results")
+                logger.debug("Cache hit! Returning cached results")
                 return cached_result
             
             # Get user preferences and filter eligible profiles
-            user_preferences = self.supabase.table('profiles') \
-                .select('gender_preference') \
-                .eq('id', user_id) \
-                .single() \
-                .execute()
+            user_preferences = await asyncio.to_thread(
+                self.supabase.table('profiles')
+                .select('gender_preference')
+                .eq('id', user_id)
+                .single()
+                .execute
+            )
             
             preferred_genders = user_preferences.data.get('gender_preference', []) if user_preferences.data else []
             
-            eligible_profiles = self.supabase.table('profiles') \
-                .select('id, name, bio, gender, location, matching_prompt, photos, verification_status') \
-                .in_('gender', preferred_genders) \
-                .eq('verification_status', 'approved') \
-                .execute()
+            eligible_profiles = await asyncio.to_thread(
+                self.supabase.table('profiles')
+                .select('id, name, bio, gender, location, matching_prompt, photos, verification_status')
+                .in_('gender', preferred_genders)
+                .eq('verification_status', 'approved')
+                .execute
+            )
 
             
             if not eligible_profiles.data:
                 return {'results': [], 'meta': {'total_matches': 0}}
             
-            eligible_user_ids = [p['id'] for p in eligible_profiles.data]
             profiles_lookup = {p['id']: p for p in eligible_profiles.data}
             
-            # Generate embedding for query
-            query_embedding = await self.get_embedding(response)
-
-            
-            # Normalize query embedding using L2 normalization
-            query_norm = np.linalg.norm(query_embedding)
-            if query_norm < 1e-8:
-                return {'results': [], 'meta': {'total_matches': 0}}
-            normalized_query = query_embedding / query_norm
-            
             # Perform semantic search with cosine similarity
             k = min(self.index.ntotal, 100)  # Get top 100 candidates
             distances, indices = self.index.search(
-                normalized_query.reshape(1, -1).astype('float32'),
+                normalized_query.reshape(1, -1),
                 k
             )
             
@@ -208,7 +228,7 @@ class OptimizedEmbeddingManager:
 
                     
                 user_id = embedding_record['user_id']
-                if user_id in seen_user_ids or user_id not in eligible_user_ids:
+                if user_id in seen_user_ids or user_id not in profiles_lookup:
                     continue
                     
                 if user_id in profiles_lookup:
@@ -225,10 +245,9 @@ class OptimizedEmbeddingManager:
                         'profile': profiles_lookup[user_id]
                     })
                     seen_user_ids.add(user_id)
-            
-            # Sort by similarity score in descending order (higher is better)
-            results.sort(key=lambda x: x['similarity_score'], reverse=True)
-            results = results[:per_page]
+                    # FAISS returns neighbours best-first, so the first per_page hits are the top results
+                    if len(results) == per_page:
+                        break
             
             # Calculate metadata
             if results:
@@ -262,7 +281,7 @@ class OptimizedEmbeddingManager:
             return response_data
                 
         except Exception as e:
-            print(f"Error in search_similar_responses: {str(e)}")
+            logger.error("Error in search_similar_responses: %s", e)
             raise Exception(f"Failed to search similar responses: {str(e)}")   
      
     async def create_text_embeddings(
@@ -275,58 +294,72 @@ class OptimizedEmbeddingManager:
     ) -> List[Dict[str, Any]]:
         """Create embeddings with optimized batch processing"""
         try:
-            # Delete existing embeddings
-            delete_result = self.supabase.table("embeddings") \
-                .delete() \
+            # Delete existing embeddings in a worker thread while encoding runs,
+            # the insert below waits for it to finish
+            delete_query = self.supabase.table("embeddings") \
+                .delete(returning=ReturnMethod.minimal) \
                 .eq('user_id', user_id) \
                 .eq('data_type', data_type) \
-                .eq('embedding_type', embedding_type) \
-                .execute()
+                .eq('embedding_type', embedding_type)
+            delete_task = asyncio.create_task(asyncio.to_thread(delete_query.execute))
+            
+            created_at = datetime.now(timezone.utc).isoformat()
             
-            print(f"Deleted existing embeddings for user {user_id}")
+            # One encode call over all items, the model batches internally and
+            # sorts by length so each batch of 32 pads as little as possible
+            encoded = await self.get_embeddings_batch(items)
+            embeddings = encoded.astype(np.float32, copy=False).tolist()
+            logger.debug("Processed %d embeddings", len(embeddings))
+            
+            await delete_task
+            logger.debug("Deleted existing embeddings for user %s", user_id)
+            
+            # Insert everything in as few requests as possible, each request
+            # is a full HTTP round trip and a separate statement in Postgres
             results = []
-            batch_size = 32  # Process in batches for better performance
+            insert_chunk_size = 500
             
-            for i in range(0, len(items), batch_size):
-                batch = items[i:i + batch_size]
-                batch_embeddings = []
-                
-                # Generate embeddings for the batch
-                for item in batch:
-                    embedding = await self.get_embedding(item)
-                    embedding_list = embedding.tolist() if isinstance(embedding, np.ndarray) else list(embedding)
-                    batch_embeddings.append(embedding_list)
-                
-                # Prepare batch records
-                batch_records = [
+            for i in range(0, len(embeddings), insert_chunk_size):
+                chunk_embeddings = embeddings[i:i + insert_chunk_size]
+                chunk_records = [
                     {
                         "user_id": user_id,
                         "agent_id": agent_id,
                         "embedding": embedding,
                         "embedding_type": embedding_type,
                         "data_type": data_type,
-                        "created_at": datetime.utcnow().isoformat()
+                        "created_at": created_at
                     }
-                    for embedding in batch_embeddings
+                    for embedding in chunk_embeddings
                 ]
                 
-                # Batch insert
-                result = self.supabase.table("embeddings") \
-                    .insert(batch_records) \
-                    .execute()
+                result = await asyncio.to_thread(
+                    self.supabase.table("embeddings")
+                    .insert(chunk_records)
+                    .execute
+                )
                 
                 if result.data:
-                    # Convert back to numpy arrays for FAISS
-                    normalized_embeddings = np.vstack([
-                        np.array(embedding) / np.linalg.norm(np.array(embedding))
-                        for embedding in batch_embeddings
-                    ])
-                    self.index.add(normalized_embeddings.astype('float32'))
+                    # Already normalized at encode time
+                    self.index.add(np.asarray(chunk_embeddings, dtype=np.float32))
                     results.extend(result.data)
-                    print(f"Processed batch of {len(batch)} embeddings")
+                    logger.debug("Inserted %d embeddings", len(chunk_records))
             
             return results
             
         except Exception as e:
-            print(f"Error in create_text_embeddings: {str(e)}")
-            raise Exception(f"Failed to create text embeddings: {str(e)}")
\ No newline at end of file
+            logger.error("Error in create_text_embeddings: %s", e)
+            raise Exception(f"Failed to create text embeddings: {str(e)}")
+
+
+_embedding_manager: Optional[OptimizedEmbeddingManager] = None
+_embedding_manager_lock = threading.Lock()
+
+def get_embedding_manager() -> OptimizedEmbeddingManager:
+    """Return the process-wide embedding manager, creating it on first use"""
+    global _embedding_manager
+    if _embedding_manager is None:
+        with _embedding_manager_lock:
+            if _embedding_manager is None:
+                _embedding_manager = OptimizedEmbeddingManager()
+    return _embedding_manager
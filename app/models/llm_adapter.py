@@ -1,7 +1,9 @@
 # app/models/llm_adapter.py
 
 import requests
+from requests.adapters import HTTPAdapter
 import logging
+import time
 from typing import Dict, Any, Optional
 from abc import ABC, abstractmethod
 
@@ -37,6 +39,9 @@ class LLMAdapter(ABC):
         pass
 
 class APILLMAdapter(LLMAdapter):
+    # Seconds to skip the API after a transient failure before trying again
+    _RETRY_COOLDOWN = 30.0
+
     def __init__(
         self,
         api_url: str,
@@ -49,7 +54,12 @@ class APILLMAdapter(LLMAdapter):
             "Authorization": f"Bearer {api_key}"
         }
         self.model = model
-        self.is_available = True  # Track API availability
+        self.is_available = True  # Track API availability, only bad credentials turn it off
+        self._unavailable_until = 0.0
+        # Reuse keep-alive connections instead of a new TLS handshake per call
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=64))
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=64))
 
     def generate(
         self,
@@ -60,6 +70,8 @@ class APILLMAdapter(LLMAdapter):
     ) -> str:
         if not self.is_available:
             raise LLMConnectionError("LLM API is currently unavailable")
+        if time.monotonic() < self._unavailable_until:
+            raise LLMConnectionError("LLM API is cooling down after a failed request")
             
         try:
             data = {
@@ -75,7 +87,7 @@ class APILLMAdapter(LLMAdapter):
                 "top_p": top_p
             }
 
-            response = requests.post(
+            response = self.session.post(
                 self.api_url,
                 headers=self.headers,
                 json=data,
@@ -95,18 +107,20 @@ class APILLMAdapter(LLMAdapter):
                 raise ValueError("Invalid API response format")
             
         except requests.exceptions.RequestException as e:
-            self.is_available = False
             if isinstance(e, requests.exceptions.HTTPError) and e.response.status_code == 401:
+                self.is_available = False
                 raise LLMAuthenticationError("Invalid API credentials")
-            else:
-                raise LLMConnectionError(f"Failed to connect to LLM API: {str(e)}")
+            # Timeouts, resets and 5xx are transient, back off briefly instead of
+            # disabling the adapter for the life of the shared AgentSystem
+            self._unavailable_until = time.monotonic() + self._RETRY_COOLDOWN
+            raise LLMConnectionError(f"Failed to connect to LLM API: {str(e)}")
         except Exception as e:
             logger.error(f"API LLM generation error: {e}")
             raise LLMError(f"Error generating LLM response: {str(e)}")
 
     def close(self):
-        """No cleanup needed for API model."""
-        pass
+        """Release pooled HTTP connections."""
+        self.session.close()
 
 def create_llm_adapter(config: Dict[str, Any]) -> LLMAdapter:
     """Factory function to create appropriate LLM adapter."""
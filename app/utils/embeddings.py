@@ -0,0 +1,43 @@
+import logging
+import numpy as np
+import orjson
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+def parse_embedding_rows(records: List[Dict[str, Any]], embedding_dim: int) -> Tuple[np.ndarray, Dict[int, Dict[str, Any]]]:
+    """Parse pgvector text literals into an [N, dim] float32 array plus an index -> record map"""
+    valid_records = []
+    embedding_texts = []
+    for record in records:
+        # The vector lives in the index, keep only metadata in the map
+        embedding_str = record.pop('embedding', None)
+        if not embedding_str:
+            logger.debug("No embedding data for user %s", record['user_id'])
+        elif embedding_str.count(',') != embedding_dim - 1:
+            logger.debug("Wrong dimension for user %s", record['user_id'])
+        else:
+            valid_records.append(record)
+            embedding_texts.append(embedding_str.strip('[]'))
+
+    # One C-level parse over every row instead of a Python call per row. Newer NumPy
+    # raises on malformed text, older releases stop early, so check both
+    try:
+        embeddings_array = np.fromstring(','.join(embedding_texts), dtype=np.float32, sep=',')
+    except ValueError:
+        embeddings_array = None
+    if embeddings_array is not None and embeddings_array.size == len(valid_records) * embedding_dim:
+        return embeddings_array.reshape(-1, embedding_dim), dict(enumerate(valid_records))
+
+    # A malformed value somewhere, fall back to per-row parsing and skip the bad rows
+    parsed = []
+    embedding_map = {}
+    for record, embedding_text in zip(valid_records, embedding_texts):
+        try:
+            parsed.append(np.array(orjson.loads(f"[{embedding_text}]"), dtype=np.float32))
+            embedding_map[len(parsed) - 1] = record
+        except Exception as e:
+            logger.warning("Error processing embedding for user %s: %s", record.get('user_id'), e)
+    if not parsed:
+        return np.empty((0, embedding_dim), dtype=np.float32), {}
+    return np.vstack(parsed), embedding_map
@@ -1,29 +1,62 @@
-import json
-import hashlib
-from typing import Dict, Any, Optional
-from datetime import datetime
+import orjson
+from hashlib import blake2b
+from base64 import urlsafe_b64encode
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Union
+from datetime import datetime, timezone
+from functools import lru_cache
 
-def generate_cache_key(prefix: str, data: str) -> str:
+def generate_cache_key(
+    prefix: str,
+    data: Union[str, bytes],
+    _hasher=blake2b,
+    _b64encode=urlsafe_b64encode
+) -> str:
     """Generate a cache key for Redis"""
-    return f"{prefix}:{hashlib.md5(data.encode()).hexdigest()}"
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    # 12-byte BLAKE2b digest as urlsafe base64 is exactly 16 chars, half the size of a hex MD5
+    return f"{prefix}:{_b64encode(_hasher(data, digest_size=12).digest()).decode('ascii')}"
 
-def safe_json_loads(data: str, default: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-    """Safely load JSON data with fallback"""
+def mget_cache(redis_client, prefix: str, data_list: List[Union[str, bytes]]) -> Dict[Union[str, bytes], Any]:
+    """Fetch several cached JSON values in one MGET round trip, returning only the hits"""
+    if not data_list:
+        return {}
+    keys = [generate_cache_key(prefix, data) for data in data_list]
+    return {
+        data: orjson.loads(value)
+        for data, value in zip(data_list, redis_client.mget(keys))
+        if value is not None
+    }
+
+# Shared read-only fallback so the failure path doesn't allocate a dict per call
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+def safe_json_loads(
+    data: Union[str, bytes, bytearray, memoryview],
+    default: Optional[Dict[str, Any]] = None
+) -> Mapping[str, Any]:
+    """Safely load JSON data with fallback, bytes from Redis are parsed without decoding"""
     try:
-        return json.loads(data)
-    except (json.JSONDecodeError, TypeError):
-        return default or {}
+        return orjson.loads(data)
+    except (orjson.JSONDecodeError, TypeError):
+        return _EMPTY if default is None else default
 
 def format_timestamp(dt: datetime) -> str:
     """Format datetime for consistent timestamp representation"""
-    return dt.isoformat()
+    # Millisecond precision is all that's consumed downstream, parse_timestamp reads it back
+    return dt.isoformat(timespec='milliseconds')
+
+# Only successful parses are memoized, failures fall through to the except below
+_parse_isoformat = lru_cache(maxsize=4096)(datetime.fromisoformat)
 
 def parse_timestamp(timestamp_str: str) -> datetime:
     """Parse timestamp string to datetime object"""
     try:
-        return datetime.fromisoformat(timestamp_str)
+        return _parse_isoformat(timestamp_str)
     except (ValueError, TypeError):
-        return datetime.utcnow()
+        # Naive UTC like the parsed values, so results stay comparable
+        return datetime.now(timezone.utc).replace(tzinfo=None)
 
 def calculate_metrics(values: list) -> Dict[str, float]:
     """Calculate basic statistical metrics"""
@@ -35,15 +68,22 @@ def calculate_metrics(values: list) -> Dict[str, float]:
             'count': 0
         }
     
+    # numpy is imported on first use so truncate_text/cache-key only callers never load it
+    import numpy as np
+
+    # min/max stay builtins so callers keep the input element types
     return {
-        'mean': sum(values) / len(values),
+        'mean': float(np.mean(values, dtype=np.float64)),
         'min': min(values),
         'max': max(values),
         'count': len(values)
     }
 
-def truncate_text(text: str, max_length: int = 100) -> str:
+def truncate_text(text: str, max_length: int = 100, _ellipsis: str = "...") -> str:
     """Truncate text to specified length with ellipsis"""
-    if len(text) <= max_length:
-        return text
-    return text[:max_length-3] + "..." 
\ No newline at end of file
+    return text if len(text) <= max_length else text[:max_length - len(_ellipsis)] + _ellipsis
+
+def truncate_all(texts: List[str], max_length: int = 100, _ellipsis: str = "...") -> List[str]:
+    """Truncate every text in a list, same rules as truncate_text"""
+    cut = max_length - len(_ellipsis)
+    return [text if len(text) <= max_length else text[:cut] + _ellipsis for text in texts] 
@@ -1,19 +1,18 @@
 import aiohttp
 import logging
 import json
-from ..config.settings import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, SUPABASE_URL, SUPABASE_KEY
-from supabase import create_client
+from ..config.settings import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
+from ..db.supabase import get_supabase
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 async def update_profile_status(profile_id: str, status: str = "approved") -> bool:
     """
     Update the verification status of a profile in Supabase.
     """
     try:
-        result = supabase.table('profiles').update(
+        result = get_supabase().table('profiles').update(
             {"verification_status": status}
         ).eq('id', profile_id).execute()
         
@@ -1,8 +1,3 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,6 +6,13 @@ async def get_twitter_followers():
     """
     Scrape Twitter followers count from SwifeyAI profile
     """
+    # selenium is only needed when scraping, keep it out of app import time
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
     try:
         chrome_options = Options()
         chrome_options.add_argument('--headless')
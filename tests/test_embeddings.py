@@ -0,0 +1,42 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.utils.embeddings import parse_embedding_rows
+
+
+def test_parse_embedding_rows_parses_all_rows():
+    records = [
+        {"user_id": "a", "embedding": "[0.1,0.2,0.3]"},
+        {"user_id": "b", "embedding": "[0.4,0.5,0.6]"},
+    ]
+
+    embeddings, embedding_map = parse_embedding_rows(records, 3)
+
+    assert embeddings.shape == (2, 3)
+    assert embeddings.dtype == np.float32
+    assert [embedding_map[i]["user_id"] for i in range(2)] == ["a", "b"]
+
+
+def test_parse_embedding_rows_skips_malformed_row():
+    records = [
+        {"user_id": "a", "embedding": "[0.1,0.2,0.3]"},
+        {"user_id": "bad", "embedding": "[0.1,oops,0.3]"},
+        {"user_id": "short", "embedding": "[0.1,0.2]"},
+        {"user_id": "c", "embedding": "[0.4,0.5,0.6]"},
+    ]
+
+    embeddings, embedding_map = parse_embedding_rows(records, 3)
+
+    assert embeddings.shape == (2, 3)
+    assert embeddings.dtype == np.float32
+    np.testing.assert_allclose(embeddings, [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]], rtol=1e-6)
+    assert [embedding_map[i]["user_id"] for i in range(2)] == ["a", "c"]
+    assert all("embedding" not in record for record in embedding_map.values())
+
+
+def test_parse_embedding_rows_empty():
+    embeddings, embedding_map = parse_embedding_rows([], 3)
+
+    assert embeddings.shape == (0, 3)
+    assert embedding_map == {}